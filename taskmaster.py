@@ -17,9 +17,14 @@ License: MIT
 from __future__ import annotations
 import csv
 import datetime as dt
+from concurrent.futures import BrokenExecutor, Future, ThreadPoolExecutor
 import logging
+import os
+import re
+from array import array
 import sqlite3
-from dataclasses import dataclass
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
 from tkinter import (
     BOTH,
@@ -33,21 +38,99 @@ from tkinter import (
     filedialog,
 )
 from tkinter import ttk
-from typing import Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 # -------------------------- Configuration & Logging ------------------------- #
 
 APP_NAME = "TaskMaster"
 DB_FILENAME = Path(__file__).with_name("tasks.db")
 LOG_FILE = Path(__file__).with_name("taskmaster.log")
+CSV_BUFFER_SIZE = 1 << 23  # 8 MiB write buffer for CSV export
+# Set TASKMASTER_SQL_TRACE=1 to log every SQL statement executed (at DEBUG level)
+SQL_TRACE = bool(os.environ.get("TASKMASTER_SQL_TRACE"))
 
 logging.basicConfig(
     filename=LOG_FILE,
-    level=logging.INFO,
+    level=logging.DEBUG if SQL_TRACE else logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
 )
 logger = logging.getLogger(APP_NAME)
 
+_LIKE_WILDCARDS = re.compile(r"[%_]")
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})", re.ASCII)  # shape check before fromisoformat
+_CHECK = ("", "✔")  # "Done" column text, indexed by the completed flag
+
+# Column order shared by every Task SELECT below; _row_to_task relies on it
+_TASK_COLUMNS = "id, title, description, priority, due_date, completed"
+# Just what the task list shows (no description); _to_columns relies on it
+_DISPLAY_COLUMNS = "id, title, priority, due_date, completed"
+_ORDER_BY = "ORDER BY completed, priority DESC, due_date IS NULL, due_date"
+_SQL_INSERT = "INSERT INTO tasks (title, description, priority, due_date, completed) VALUES (?, ?, ?, ?, ?)"
+_SQL_UPDATE = "UPDATE tasks SET title=?, description=?, priority=?, due_date=?, completed=? WHERE id=?"
+_SQL_DELETE = "DELETE FROM tasks WHERE id=?"
+_SQL_TOGGLE = "UPDATE tasks SET completed = 1 - completed WHERE id=?"
+_SQL_GET_COMPLETED = "SELECT completed FROM tasks WHERE id=?"
+_SQL_ANY = "SELECT 1 FROM tasks LIMIT 1"
+_SQL_GET = f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id=?"
+_SQL_LIST = f"SELECT {_TASK_COLUMNS} FROM tasks {_ORDER_BY}"
+_SQL_LIST_DISPLAY = f"SELECT {_DISPLAY_COLUMNS} FROM tasks {_ORDER_BY}"
+
+# search() filters, combined as a bitmask to pick one of the prebuilt statements
+_SEARCH_FTS, _SEARCH_LIKE, _SEARCH_PRIORITY, _SEARCH_COMPLETED = 1, 2, 4, 8
+_SEARCH_FRAGMENTS = (
+    (_SEARCH_FTS, "id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)"),
+    (_SEARCH_LIKE, "(title LIKE ? OR description LIKE ?)"),
+    (_SEARCH_PRIORITY, "priority = ?"),
+    (_SEARCH_COMPLETED, "completed = ?"),
+)
+
+
+def _build_search_sql(columns: str) -> Dict[int, str]:
+    stmts = {}
+    for mask in range(16):
+        if mask & _SEARCH_FTS and not mask & _SEARCH_LIKE:
+            continue  # FTS only narrows the candidates; LIKE always makes the final match
+        where = " AND ".join(frag for bit, frag in _SEARCH_FRAGMENTS if mask & bit)
+        stmts[mask] = f"SELECT {columns} FROM tasks {'WHERE ' + where + ' ' if where else ''}{_ORDER_BY}"
+    return stmts
+
+
+_SQL_SEARCH = _build_search_sql(_TASK_COLUMNS)
+_SQL_SEARCH_DISPLAY = _build_search_sql(_DISPLAY_COLUMNS)
+
+# FTS5 index over title/description and the triggers keeping it in sync, as (name, sql).
+# _ensure_fts compares these with sqlite_master and only rewrites the objects that differ.
+# The trigram tokenizer indexes every 3-character run, so substring queries can use it.
+_FTS_TABLE = (
+    "tasks_fts",
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', tokenize='trigram')",
+)
+_FTS_TRIGGERS = (
+    (
+        "tasks_fts_ai",
+        """CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END""",
+    ),
+    (
+        "tasks_fts_ad",
+        """CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END""",
+    ),
+    (
+        # Only text edits touch the index; toggles and priority/date edits skip it
+        "tasks_fts_au",
+        """CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO tasks_fts(rowid, title, description) VALUES (new.id, new.title, new.description);
+        END""",
+    ),
+)
+
 
 # ------------------------------- Domain Model -------------------------------- #
 
@@ -60,6 +143,11 @@ class Task:
     due_date: Optional[dt.date]
     completed: bool
 
+    @property
+    def due_date_str(self) -> str:
+        """Display form of due_date: ISO text, or "" when there is none."""
+        return self.due_date.isoformat() if self.due_date else ""
+
     def as_tuple(self) -> Tuple:
         """Return tuple for DB insertion (excluding id)."""
         return (
@@ -71,18 +159,86 @@ class Task:
         )
 
 
+@dataclass
+class TaskColumns:
+    """Column-oriented (struct-of-arrays) task list holding only what the task list displays."""
+    ids: List[int] = field(default_factory=list)
+    titles: List[str] = field(default_factory=list)
+    priorities: array = field(default_factory=lambda: array("b"))
+    due_strs: List[str] = field(default_factory=list)
+    completed: array = field(default_factory=lambda: array("b"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def row(self, i: int) -> Tuple:
+        return (self.ids[i], self.titles[i], self.priorities[i], self.due_strs[i], self.completed[i])
+
+    def set(self, i: int, row: Tuple) -> None:
+        self.ids[i], self.titles[i], self.priorities[i], self.due_strs[i], self.completed[i] = row
+
+    def insert(self, i: int, row: Tuple) -> None:
+        for column, value in zip(self._columns(), row):
+            column.insert(i, value)
+
+    def pop(self, i: int) -> None:
+        for column in self._columns():
+            column.pop(i)
+
+    def _columns(self) -> Tuple:
+        return (self.ids, self.titles, self.priorities, self.due_strs, self.completed)
+
+    @staticmethod
+    def sort_key(row: Tuple) -> Tuple:
+        """Key matching the SQL list order (ORDER BY completed, priority DESC, due_date IS NULL, due_date)."""
+        tid, _title, priority, due, completed = row
+        return (completed, -priority, due == "", due, tid)
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple]:
+        """Yield (id, title, priority, due_str, completed) for positions start..end."""
+        return zip(
+            self.ids[start:end],
+            self.titles[start:end],
+            self.priorities[start:end],
+            self.due_strs[start:end],
+            self.completed[start:end],
+        )
+
+
 # ------------------------------- Repository ---------------------------------- #
 
 class TaskRepository:
-    """SQLite-backed repository for Task objects."""
+    """SQLite-backed repository for Task objects.
+
+    All writes go through ``with self._tx():`` (the connection's own context
+    manager outside begin()/commit()), so each logical operation commits once.
+    A repository, like its connection, is used only by the thread that created it.
+    """
 
     def __init__(self, db_path: Path = DB_FILENAME):
         self.db_path = db_path
-        self._conn = sqlite3.connect(str(self.db_path))
-        self._conn.row_factory = sqlite3.Row
+        # Large enough to keep every _SQL_SEARCH/_SQL_SEARCH_DISPLAY variant and CRUD statement prepared
+        self._conn = sqlite3.connect(str(self.db_path), cached_statements=256, isolation_level="DEFERRED")
+        if SQL_TRACE:
+            self._conn.set_trace_callback(logger.debug)
+        self._conn.row_factory = None  # plain tuples; every SELECT lists its columns explicitly
+        self._batching = False
+        self._has_fts = False
+        self._configure_connection()
         self._ensure_schema()
         logger.info("TaskRepository initialized using DB: %s", self.db_path)
 
+    def _configure_connection(self) -> None:
+        # WAL + synchronous=NORMAL: one fsync per checkpoint instead of two per commit
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-64000")  # ~64 MB page cache
+        try:
+            self._conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        except sqlite3.DatabaseError:
+            logger.info("mmap not supported on this platform; skipping mmap_size.")
+
     def _ensure_schema(self) -> None:
         sql = """
         CREATE TABLE IF NOT EXISTS tasks (
@@ -95,75 +251,190 @@ class TaskRepository:
             created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
         );
         """
-        self._conn.execute(sql)
+        with self._conn:
+            self._conn.execute(sql)
+            # Matches the ORDER BY used by list_all/search so rows come back in index order
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_sort "
+                "ON tasks(completed, priority DESC, due_date IS NULL, due_date)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority)")
+        self._ensure_fts()
+
+    def _ensure_fts(self) -> None:
+        """Create or update the FTS5 index and its triggers; no schema change when they already match."""
+        try:
+            if self._fts_changes():
+                with self._conn:
+                    # Take the write lock before re-checking, so two connections can't both migrate
+                    self._conn.execute("BEGIN IMMEDIATE")
+                    self._migrate_fts(self._fts_changes())
+            self._has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.warning("FTS5 unavailable, text search will use LIKE: %s", e)
+
+    def _fts_changes(self) -> List[Tuple[str, str]]:
+        """Return the (name, sql) FTS objects that are missing or differ from sqlite_master."""
+        wanted = (_FTS_TABLE, *_FTS_TRIGGERS)
+        names = [name for name, _sql in wanted]
+        stored = dict(
+            self._conn.execute(
+                f"SELECT name, sql FROM sqlite_master WHERE name IN ({', '.join('?' * len(names))})", names
+            )
+        )
+        return [(name, sql) for name, sql in wanted if " ".join(stored.get(name, "").split()) != " ".join(sql.split())]
+
+    def _migrate_fts(self, changes: List[Tuple[str, str]]) -> None:
+        # Runs inside the caller's transaction, so the index and triggers change atomically
+        for name, sql in changes:
+            if name == _FTS_TABLE[0]:
+                self._conn.execute(f"DROP TABLE IF EXISTS {name}")
+                self._conn.execute(sql)
+                # Index rows that existed before this table (or this definition of it)
+                self._conn.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+            else:
+                self._conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                self._conn.execute(sql)
+        logger.info("Updated FTS schema: %s", ", ".join(name for name, _sql in changes))
+
+    # -------------------- Transactions -------------------- #
+    def begin(self) -> None:
+        """Start an explicit transaction; writes are held until commit()."""
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+        self._batching = True
+
+    def commit(self) -> None:
+        self._batching = False
         self._conn.commit()
 
+    def rollback(self) -> None:
+        self._batching = False
+        self._conn.rollback()
+
+    def _tx(self):
+        """Context for a single write: commits on exit unless inside begin()/commit()."""
+        return nullcontext() if self._batching else self._conn
+
+    # -------------------- CRUD -------------------- #
     def add(self, task: Task) -> int:
-        cur = self._conn.execute(
-            "INSERT INTO tasks (title, description, priority, due_date, completed) VALUES (?, ?, ?, ?, ?)",
-            task.as_tuple(),
-        )
-        self._conn.commit()
+        with self._tx():
+            cur = self._conn.execute(_SQL_INSERT, task.as_tuple())
         task_id = cur.lastrowid
         logger.info("Added task %s (id=%s)", task.title, task_id)
         return task_id
 
+    def add_many(self, tasks: Iterable[Task]) -> None:
+        """Insert several tasks in a single transaction."""
+        rows = [t.as_tuple() for t in tasks]
+        with self._tx():
+            self._conn.executemany(_SQL_INSERT, rows)
+        logger.info("Added %d tasks", len(rows))
+
     def update(self, task: Task) -> None:
         if task.id is None:
             raise ValueError("Task id is required for update.")
-        self._conn.execute(
-            "UPDATE tasks SET title=?, description=?, priority=?, due_date=?, completed=? WHERE id=?",
-            (*task.as_tuple(), 1 if task.completed else 0, task.id),
-        )
-        self._conn.commit()
+        with self._tx():
+            self._conn.execute(_SQL_UPDATE, (*task.as_tuple(), task.id))
         logger.info("Updated task id=%s title=%s", task.id, task.title)
 
     def delete(self, task_id: int) -> None:
-        self._conn.execute("DELETE FROM tasks WHERE id=?", (task_id,))
-        self._conn.commit()
+        with self._tx():
+            self._conn.execute(_SQL_DELETE, (task_id,))
         logger.info("Deleted task id=%s", task_id)
 
+    def toggle_completed(self, task_id: int) -> Optional[bool]:
+        """Flip the completed flag in place; return the new value, or None if no such task."""
+        with self._tx():
+            cur = self._conn.execute(_SQL_TOGGLE, (task_id,))
+            if cur.rowcount == 0:
+                return None
+            (completed,) = self._conn.execute(_SQL_GET_COMPLETED, (task_id,)).fetchone()
+        logger.info("Toggled task id=%s completed=%s", task_id, bool(completed))
+        return bool(completed)
+
+    def is_empty(self) -> bool:
+        return self._conn.execute(_SQL_ANY).fetchone() is None
+
     def get(self, task_id: int) -> Optional[Task]:
-        cur = self._conn.execute("SELECT * FROM tasks WHERE id=?", (task_id,))
+        cur = self._conn.execute(_SQL_GET, (task_id,))
         row = cur.fetchone()
         return self._row_to_task(row) if row else None
 
     def list_all(self) -> List[Task]:
-        cur = self._conn.execute("SELECT * FROM tasks ORDER BY completed, priority DESC, due_date IS NULL, due_date")
+        cur = self._conn.execute(_SQL_LIST)
         rows = cur.fetchall()
         return [self._row_to_task(r) for r in rows]
 
+    def list_all_columns(self) -> TaskColumns:
+        return self._to_columns(self._conn.execute(_SQL_LIST_DISPLAY).fetchall())
+
+    def iter_all(self) -> Iterator[Tuple]:
+        """Yield raw rows (in _TASK_COLUMNS order) straight from the cursor, no Task objects."""
+        return self._conn.execute(_SQL_LIST)
+
     def search(self, text: str = "", priority: Optional[int] = None, show_completed: Optional[bool] = None) -> List[Task]:
-        sql = "SELECT * FROM tasks WHERE 1=1"
-        params: List = []
-        if text:
-            sql += " AND (title LIKE ? OR description LIKE ?)"
-            txt = f"%{text}%"
-            params.extend([txt, txt])
+        return [self._row_to_task(r) for r in self._search_rows(_SQL_SEARCH, text, priority, show_completed)]
+
+    def search_columns(
+        self, text: str = "", priority: Optional[int] = None, show_completed: Optional[bool] = None
+    ) -> TaskColumns:
+        return self._to_columns(self._search_rows(_SQL_SEARCH_DISPLAY, text, priority, show_completed))
+
+    def _search_rows(
+        self, stmts: Dict[int, str], text: str, priority: Optional[int], show_completed: Optional[bool]
+    ) -> List[Tuple]:
+        """Rows whose title or description contains `text` (LIKE '%text%'), in list order.
+
+        When the trigram index can answer the query, its phrase match picks the candidate
+        rows and the same LIKE test filters them, so results always equal a plain LIKE scan.
+        """
+        # Params follow _SEARCH_FRAGMENTS order: text first, then the filters
+        mask = 0
+        filters: List = []
         if priority is not None:
-            sql += " AND priority = ?"
-            params.append(priority)
+            mask |= _SEARCH_PRIORITY
+            filters.append(priority)
         if show_completed is not None:
-            sql += " AND completed = ?"
-            params.append(1 if show_completed else 0)
-        sql += " ORDER BY completed, priority DESC, due_date IS NULL, due_date"
-        cur = self._conn.execute(sql, params)
-        return [self._row_to_task(r) for r in cur.fetchall()]
+            mask |= _SEARCH_COMPLETED
+            filters.append(1 if show_completed else 0)
+        if not text:
+            return self._conn.execute(stmts[mask], filters).fetchall()
+        txt = f"%{text}%"
+        # Trigrams need 3+ characters, and LIKE wildcards in the text have no phrase equivalent
+        if self._has_fts and len(text) >= 3 and not _LIKE_WILDCARDS.search(text):
+            phrase = '"' + text.replace('"', '""') + '"'
+            return self._conn.execute(stmts[mask | _SEARCH_FTS | _SEARCH_LIKE], [phrase, txt, txt, *filters]).fetchall()
+        return self._conn.execute(stmts[mask | _SEARCH_LIKE], [txt, txt, *filters]).fetchall()
 
     @staticmethod
-    def _row_to_task(row: sqlite3.Row) -> Task:
-        due = row["due_date"]
-        due_date = dt.date.fromisoformat(due) if due else None
+    def _to_columns(rows: List[Tuple]) -> TaskColumns:
+        if not rows:
+            return TaskColumns()
+        ids, titles, priorities, dues, completed = zip(*rows)  # _DISPLAY_COLUMNS order
+        return TaskColumns(
+            ids=list(ids),
+            titles=list(titles),
+            priorities=array("b", priorities),
+            due_strs=[d or "" for d in dues],
+            completed=array("b", completed),
+        )
+
+    @staticmethod
+    def _row_to_task(row: Tuple) -> Task:
+        tid, title, desc, pri, due, comp = row  # _TASK_COLUMNS order
         return Task(
-            id=int(row["id"]),
-            title=row["title"],
-            description=row["description"] or "",
-            priority=int(row["priority"]),
-            due_date=due_date,
-            completed=bool(row["completed"]),
+            id=tid,
+            title=title,
+            description=desc or "",
+            priority=pri,
+            due_date=dt.date.fromisoformat(due) if due else None,
+            completed=bool(comp),
         )
 
     def close(self) -> None:
+        # Refreshes planner statistics for tables whose size changed noticeably (cheap when nothing did)
+        self._conn.execute("PRAGMA optimize")
         self._conn.close()
         logger.info("TaskRepository connection closed.")
 
@@ -172,11 +443,25 @@ class TaskRepository:
 
 class TaskMasterApp:
     PRIORITY_CHOICES = [1, 2, 3, 4, 5]
+    TREE_PAGE_SIZE = 200  # rows inserted into the Treeview per batch
+    SEARCH_DEBOUNCE_MS = 150  # quiet period after the last keystroke before searching
+    WORKER_POLL_MS = 15  # how often the Tk loop checks for a finished background query
 
     def __init__(self, root: Tk):
         self.root = root
         self.root.title(APP_NAME)
         self.repo = TaskRepository()
+        self._rows = TaskColumns()
+        self._materialized = 0  # how many of self._rows are currently in the tree
+        self._displayed: Dict[int, Tuple] = {}  # task id -> values currently shown in the tree
+        self._search_after_id: Optional[str] = None
+        # Reads and exports run here on their own connection so slow queries don't block the UI
+        self._reader: Optional[TaskRepository] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db", initializer=self._open_reader)
+        self._load_seq = 0
+        self._worker_broken = False  # the reader failed to open; reported once, not on every load
+        # (query, error_msg) of a load whose result hasn't been shown yet, so local writes can rerun it
+        self._pending_load: Optional[Tuple[Callable[[TaskRepository], TaskColumns], str]] = None
         self._build_ui()
         self._refresh_tasks()
 
@@ -195,6 +480,7 @@ class TaskMasterApp:
         self.search_entry = ttk.Entry(controls, textvariable=self.search_var, width=30)
         self.search_entry.pack(side=LEFT)
         self.search_entry.bind("<Return>", lambda e: self._on_search())
+        self.search_var.trace_add("write", self._on_search_changed)
 
         ttk.Button(controls, text="Search", command=self._on_search).pack(side=LEFT, padx=6)
         ttk.Button(controls, text="Reset", command=self._on_reset).pack(side=LEFT)
@@ -217,6 +503,8 @@ class TaskMasterApp:
         self.tree.column("due_date", width=100, anchor="center")
         self.tree.column("completed", width=60, anchor="center")
         self.tree.pack(fill=BOTH, expand=True)
+        # Called by Tk on every view change (wheel, keys, resize); used to load more rows
+        self.tree.configure(yscrollcommand=self._on_tree_scrolled)
 
         # Context / action buttons
         actions = ttk.Frame(main)
@@ -231,18 +519,190 @@ class TaskMasterApp:
 
     # -------------------- Data / Helpers -------------------- #
     def _refresh_tasks(self) -> None:
+        self._load_tasks(lambda repo: repo.list_all_columns(), "Failed to refresh tasks")
+
+    def _load_tasks(self, query: Callable[[TaskRepository], TaskColumns], error_msg: str) -> None:
+        """Run `query` in the background and show its result, unless a newer load superseded it."""
+        self._load_seq += 1
+        seq = self._load_seq
+        self._pending_load = (query, error_msg)
+
+        def finished() -> None:
+            if seq == self._load_seq:
+                self._pending_load = None
+
+        def deliver(cols: TaskColumns) -> None:
+            if seq == self._load_seq:
+                self._pending_load = None
+                self._populate_tree(cols)
+
+        self._submit(query, deliver, error_msg, on_error=finished)
+
+    def _after_local_write(self) -> None:
+        """A load still in flight may have read the DB before this write: discard it and rerun it."""
+        if self._pending_load is not None:
+            self._load_tasks(*self._pending_load)
+
+    def _populate_tree(self, cols: TaskColumns) -> None:
+        """Sync the tree with `cols`, touching only rows that were added, removed or changed."""
+        self._rows = cols
+        # Keep as many rows as were already loaded so the scroll position survives a refresh
+        end = min(len(cols), max(self._materialized, self.TREE_PAGE_SIZE))
+        check = _CHECK
+        new = {tid: (tid, title, pri, due, check[done]) for tid, title, pri, due, done in cols.rows(0, end)}
+        removed = self._displayed.keys() - new.keys()
+        if removed:
+            self.tree.delete(*(str(tid) for tid in removed))
+        # Bound to locals: this loop runs once per displayed row
+        insert, item, displayed = self.tree.insert, self.tree.item, self._displayed
+        for tid, values in new.items():
+            old = displayed.get(tid)
+            if old is None:
+                insert("", END, iid=str(tid), values=values)
+            elif old != values:
+                item(str(tid), values=values)
+        order = tuple(str(tid) for tid in new)
+        if self.tree.get_children() != order:
+            self.tree.set_children("", *order)
+        self._displayed = new
+        self._materialized = end
+
+    def _materialize(self, count: int) -> None:
+        """Insert the next `count` cached rows into the tree."""
+        end = min(len(self._rows), self._materialized + count)
+        insert, displayed, check = self.tree.insert, self._displayed, _CHECK
+        for tid, title, pri, due, done in self._rows.rows(self._materialized, end):
+            values = displayed[tid] = (tid, title, pri, due, check[done])
+            insert("", END, iid=str(tid), values=values)
+        self._materialized = end
+
+    # Single-row edits: patch the cached columns and the one affected tree row, no reload.
+    # Every patch puts the row at its sorted position, so self._rows stays sorted by
+    # TaskColumns.sort_key, which the binary search and neighbour checks below rely on.
+    @staticmethod
+    def _task_row(task: Task) -> Tuple:
+        return (task.id, task.title, task.priority, task.due_date_str, int(task.completed))
+
+    def _insert_tree_row(self, row: Tuple) -> None:
+        """Insert a row at its sorted position; it is shown now if that part of the list is loaded."""
+        cols = self._rows
+        if row[0] in cols.ids:
+            # Already there, e.g. a reload delivered while the editor's "Saved" box was open
+            self._update_tree_row(row)
+            return
+        key = TaskColumns.sort_key(row)
+        lo, hi = 0, len(cols)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if TaskColumns.sort_key(cols.row(mid)) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        fully_loaded = self._materialized == len(cols)
+        cols.insert(lo, row)
+        if lo < self._materialized or fully_loaded:
+            iid = str(row[0])
+            self._displayed[row[0]] = values = (*row[:4], _CHECK[row[4]])
+            self.tree.insert("", lo, iid=iid, values=values)
+            self._materialized += 1
+            self.tree.selection_set(iid)
+            self.tree.see(iid)
+
+    def _update_tree_row(self, row: Tuple) -> None:
+        """Replace a row's values, moving it if its sort position changed."""
+        cols = self._rows
+        tid = row[0]
         try:
-            tasks = self.repo.list_all()
-            self._populate_tree(tasks)
+            i = cols.ids.index(tid)
+        except ValueError:
+            self._insert_tree_row(row)
+            return
+        key = TaskColumns.sort_key(row)
+        stays_put = (i == 0 or TaskColumns.sort_key(cols.row(i - 1)) <= key) and (
+            i == len(cols) - 1 or key <= TaskColumns.sort_key(cols.row(i + 1))
+        )
+        if not stays_put:
+            self._remove_tree_row(tid)
+            self._insert_tree_row(row)
+            return
+        cols.set(i, row)
+        if tid in self._displayed:
+            self._displayed[tid] = values = (*row[:4], _CHECK[row[4]])
+            self.tree.item(str(tid), values=values)
+
+    def _remove_tree_row(self, tid: int) -> None:
+        try:
+            self._rows.pop(self._rows.ids.index(tid))
+        except ValueError:
+            return
+        if self._displayed.pop(tid, None) is not None:
+            self.tree.delete(str(tid))
+            self._materialized -= 1
+
+    def _on_tree_scrolled(self, first: str, last: str) -> None:
+        # Load the next page once the viewport nears the last materialized row
+        if self._materialized < len(self._rows) and float(last) >= 0.9:
+            self._materialize(self.TREE_PAGE_SIZE)
+
+    # -------------------- Background work -------------------- #
+    def _open_reader(self) -> None:
+        # Runs on the worker thread: an sqlite connection belongs to the thread that opened it
+        self._reader = TaskRepository(self.repo.db_path)
+
+    def _submit(
+        self,
+        fn: Callable[[TaskRepository], Any],
+        on_success: Callable[[Any], None],
+        error_msg: str,
+        on_error: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Run fn(reader) on the worker thread and hand its result to on_success on the Tk thread."""
+        try:
+            fut = self._executor.submit(lambda: fn(self._reader))
+        except RuntimeError as e:  # BrokenExecutor, or submit after shutdown
+            if on_error is not None:
+                on_error()
+            self._report_worker_error(error_msg, e)
+            return
+        self.root.after(self.WORKER_POLL_MS, self._poll_future, fut, on_success, error_msg, on_error)
+
+    def _poll_future(
+        self,
+        fut: Future,
+        on_success: Callable[[Any], None],
+        error_msg: str,
+        on_error: Optional[Callable[[], None]],
+    ) -> None:
+        # Polled from the Tk loop so widgets are only ever touched on the main thread
+        if not fut.done():
+            self.root.after(self.WORKER_POLL_MS, self._poll_future, fut, on_success, error_msg, on_error)
+            return
+        try:
+            on_success(fut.result())
         except Exception as e:
-            logger.exception("Failed to refresh tasks: %s", e)
-            messagebox.showerror(APP_NAME, f"Failed to refresh tasks: {e}")
+            if on_error is not None:
+                on_error()
+            self._report_worker_error(error_msg, e)
+
+    def _report_worker_error(self, error_msg: str, e: Exception) -> None:
+        logger.error("%s: %s", error_msg, e, exc_info=e)
+        if isinstance(e, BrokenExecutor):
+            # Every later submit fails the same way; one dialog is enough
+            if self._worker_broken:
+                return
+            self._worker_broken = True
+        messagebox.showerror(APP_NAME, f"{error_msg}: {e}")
 
-    def _populate_tree(self, tasks: Iterable[Task]) -> None:
-        self.tree.delete(*self.tree.get_children())
-        for t in tasks:
-            due = t.due_date.isoformat() if t.due_date else ""
-            self.tree.insert("", END, iid=str(t.id), values=(t.id, t.title, t.priority, due, "✔" if t.completed else ""))
+    def close(self) -> None:
+        try:
+            if self._reader is not None:
+                # The reader connection must be closed on the worker thread that opened it
+                self._executor.submit(self._reader.close).result()
+        except Exception:
+            logger.exception("Failed to close background DB connection.")
+        finally:
+            self._executor.shutdown(wait=True)
+            self.repo.close()
 
     def _selected_task_id(self) -> Optional[int]:
         sel = self.tree.selection()
@@ -251,24 +711,32 @@ class TaskMasterApp:
         return int(sel[0])
 
     # -------------------- Actions -------------------- #
+    def _on_search_changed(self, *_args) -> None:
+        # Live search: restart the timer on each keystroke so only the last one queries
+        self._cancel_pending_search()
+        self._search_after_id = self.root.after(self.SEARCH_DEBOUNCE_MS, self._on_search)
+
+    def _cancel_pending_search(self) -> None:
+        if self._search_after_id is not None:
+            self.root.after_cancel(self._search_after_id)
+            self._search_after_id = None
+
     def _on_search(self) -> None:
+        self._cancel_pending_search()
         txt = self.search_var.get().strip()
-        try:
-            results = self.repo.search(text=txt)
-            self._populate_tree(results)
-        except Exception as e:
-            logger.exception("Search failed: %s", e)
-            messagebox.showerror(APP_NAME, "Search failed: " + str(e))
+        self._load_tasks(lambda repo: repo.search_columns(text=txt), "Search failed")
 
     def _on_reset(self) -> None:
         self.search_var.set("")
+        self._cancel_pending_search()
         self._refresh_tasks()
 
     def _open_new_task(self) -> None:
         editor = TaskEditor(self.root, self.repo)
         self.root.wait_window(editor.top)
-        # after dialog closes, refresh
-        self._refresh_tasks()
+        if editor.saved:
+            self._insert_tree_row(self._task_row(editor.saved))
+            self._after_local_write()
 
     def _on_edit(self) -> None:
         tid = self._selected_task_id()
@@ -281,7 +749,9 @@ class TaskMasterApp:
             return
         editor = TaskEditor(self.root, self.repo, task)
         self.root.wait_window(editor.top)
-        self._refresh_tasks()
+        if editor.saved:
+            self._update_tree_row(self._task_row(editor.saved))
+            self._after_local_write()
 
     def _on_delete(self) -> None:
         tid = self._selected_task_id()
@@ -291,27 +761,31 @@ class TaskMasterApp:
         if messagebox.askyesno(APP_NAME, "Delete selected task?"):
             try:
                 self.repo.delete(tid)
-                self._refresh_tasks()
             except Exception as e:
                 logger.exception("Delete failed: %s", e)
                 messagebox.showerror(APP_NAME, "Delete failed: " + str(e))
+                return
+            self._remove_tree_row(tid)
+            self._after_local_write()
 
     def _on_toggle_done(self) -> None:
         tid = self._selected_task_id()
         if not tid:
             messagebox.showinfo(APP_NAME, "Select a task.")
             return
-        t = self.repo.get(tid)
-        if not t:
-            messagebox.showerror(APP_NAME, "Task not found.")
-            return
-        t.completed = not t.completed
         try:
-            self.repo.update(t)
-            self._refresh_tasks()
+            done = self.repo.toggle_completed(tid)
         except Exception as e:
             logger.exception("Toggle failed: %s", e)
             messagebox.showerror(APP_NAME, "Toggle failed: " + str(e))
+            return
+        if done is None:
+            messagebox.showerror(APP_NAME, "Task not found.")
+            return
+        # Patch just this row; completed leads the sort order, so it moves to its sorted slot
+        row = self._rows.row(self._rows.ids.index(tid))
+        self._update_tree_row((*row[:4], int(done)))
+        self._after_local_write()
 
     def _export_csv(self) -> None:
         path = filedialog.asksaveasfilename(
@@ -319,18 +793,21 @@ class TaskMasterApp:
         )
         if not path:
             return
-        try:
-            tasks = self.repo.list_all()
-            with open(path, "w", newline="", encoding="utf-8") as fh:
-                writer = csv.writer(fh)
-                writer.writerow(["id", "title", "description", "priority", "due_date", "completed"])
-                for t in tasks:
-                    writer.writerow([t.id, t.title, t.description, t.priority, t.due_date.isoformat() if t.due_date else "", int(t.completed)])
-            messagebox.showinfo(APP_NAME, f"Tasks exported to {path}")
-            logger.info("Exported tasks to CSV: %s", path)
-        except Exception as e:
-            logger.exception("Export failed: %s", e)
-            messagebox.showerror(APP_NAME, "Export failed: " + str(e))
+        self._submit(lambda repo: self._write_csv(repo, path), lambda _: self._on_exported(path), "Export failed")
+
+    @staticmethod
+    def _write_csv(repo: TaskRepository, path: str) -> None:
+        with open(path, "w", newline="", encoding="utf-8", buffering=CSV_BUFFER_SIZE) as fh:
+            writer = csv.writer(fh)
+            writer.writerow(["id", "title", "description", "priority", "due_date", "completed"])
+            writer.writerows(
+                (tid, title, desc or "", pri, due or "", done)
+                for tid, title, desc, pri, due, done in repo.iter_all()
+            )
+
+    def _on_exported(self, path: str) -> None:
+        messagebox.showinfo(APP_NAME, f"Tasks exported to {path}")
+        logger.info("Exported tasks to CSV: %s", path)
 
 
 # ------------------------------- Task Editor Dialog --------------------------- #
@@ -341,6 +818,7 @@ class TaskEditor:
     def __init__(self, parent: Tk, repo: TaskRepository, task: Optional[Task] = None):
         self.repo = repo
         self.task = task
+        self.saved: Optional[Task] = None  # the stored task (with id) once Save succeeds
         self.top = Toplevel(parent)
         self.top.title("Edit Task" if task else "New Task")
         self.top.transient(parent)
@@ -358,7 +836,7 @@ class TaskEditor:
         self.priority_combo.grid(row=1, column=1, sticky="w", padx=6, pady=6)
 
         ttk.Label(self.top, text="Due date (YYYY-MM-DD):").grid(row=2, column=0, sticky="w", padx=6)
-        self.due_var = StringVar(value=task.due_date.isoformat() if task and task.due_date else "")
+        self.due_var = StringVar(value=task.due_date_str if task else "")
         self.due_entry = ttk.Entry(self.top, textvariable=self.due_var, width=15)
         self.due_entry.grid(row=2, column=1, sticky="w", padx=6, pady=6)
 
@@ -395,10 +873,12 @@ class TaskEditor:
             return False, "Priority must be an integer between 1 and 5."
         due = self.due_var.get().strip()
         if due:
-            try:
-                dt.date.fromisoformat(due)
-            except Exception:
+            if not _DATE_RE.fullmatch(due):
                 return False, "Due date must be in YYYY-MM-DD format."
+            try:
+                dt.date.fromisoformat(due)  # still needed to reject e.g. 2024-02-30
+            except ValueError:
+                return False, "Due date must be a valid calendar date."
         return True, None
 
     def _on_save(self) -> None:
@@ -418,6 +898,7 @@ class TaskEditor:
             try:
                 # Update existing
                 self.repo.update(updated)
+                self.saved = updated
                 messagebox.showinfo("Saved", "Task updated.")
             except Exception as e:
                 logger.exception("Failed to update task: %s", e)
@@ -425,7 +906,8 @@ class TaskEditor:
         else:
             new_task = Task(id=None, title=title, description=desc, priority=priority, due_date=due_date, completed=completed)
             try:
-                self.repo.add(new_task)
+                new_task.id = self.repo.add(new_task)
+                self.saved = new_task
                 messagebox.showinfo("Saved", "Task added.")
             except Exception as e:
                 logger.exception("Failed to add task: %s", e)
@@ -449,11 +931,13 @@ def main() -> None:
         pass
     app = TaskMasterApp(root)
     # Populate with a sample if DB empty
-    if not app.repo.list_all():
+    if app.repo.is_empty():
         try:
-            app.repo.add(Task(id=None, title="Welcome to TaskMaster", description="Edit or delete this sample task.", priority=3, due_date=None, completed=False))
-            app.repo.add(Task(id=None, title="Finish report", description="Complete the quarterly report.", priority=4, due_date=dt.date.today() + dt.timedelta(days=3), completed=False))
-            app.repo.add(Task(id=None, title="Pay bills", description="Utilities and internet", priority=2, due_date=dt.date.today() + dt.timedelta(days=7), completed=False))
+            app.repo.add_many([
+                Task(id=None, title="Welcome to TaskMaster", description="Edit or delete this sample task.", priority=3, due_date=None, completed=False),
+                Task(id=None, title="Finish report", description="Complete the quarterly report.", priority=4, due_date=dt.date.today() + dt.timedelta(days=3), completed=False),
+                Task(id=None, title="Pay bills", description="Utilities and internet", priority=2, due_date=dt.date.today() + dt.timedelta(days=7), completed=False),
+            ])
             app._refresh_tasks()
         except Exception:
             logger.exception("Failed to insert sample tasks.")
@@ -461,7 +945,7 @@ def main() -> None:
     try:
         root.mainloop()
     finally:
-        app.repo.close()
+        app.close()
         logger.info("Exiting %s", APP_NAME)
 
 